@@ -3,9 +3,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import folium
-from streamlit_folium import st_folium
 import numpy as np
+import time
 from datetime import datetime, timedelta
 import data_loader
 import visualization
@@ -19,51 +18,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Theme selector in sidebar
-def apply_theme():
-    theme = st.sidebar.selectbox(
-        "🎨 Choose Theme",
-        ["Light Theme", "Dark Theme"],
-        help="Select your preferred theme"
-    )
-    
-    if theme == "Dark Theme":
-        st.markdown("""
-        <style>
-        .stApp {
-            background-color: #0e1117;
-            color: #fafafa;
-        }
-        .stSidebar {
-            background-color: #262730;
-        }
-        .metric-card {
-            background-color: #262730 !important;
-            border-left-color: #ff6b6b !important;
-            color: #fafafa !important;
-        }
-        .alert-box {
-            background-color: #3d4043 !important;
-            border-color: #ff6b6b !important;
-            color: #fafafa !important;
-        }
-        div[data-testid="stMetricValue"] {
-            color: #fafafa;
-        }
-        div[data-testid="stMetricLabel"] {
-            color: #fafafa;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    
-    return theme
-
-# Apply theme
-current_theme = apply_theme()
-
 # Custom CSS for better styling
-st.markdown("""
-<style>
+BASE_CSS = """
 .metric-card {
     background-color: #f8f9fa;
     padding: 1rem;
@@ -77,8 +33,189 @@ st.markdown("""
     padding: 0.75rem;
     margin-bottom: 1rem;
 }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+DARK_THEME_CSS = """
+.stApp {
+    background-color: #0e1117;
+    color: #fafafa;
+}
+.stSidebar {
+    background-color: #262730;
+}
+.metric-card {
+    background-color: #262730 !important;
+    border-left-color: #ff6b6b !important;
+    color: #fafafa !important;
+}
+.alert-box {
+    background-color: #3d4043 !important;
+    border-color: #ff6b6b !important;
+    color: #fafafa !important;
+}
+div[data-testid="stMetricValue"] {
+    color: #fafafa;
+}
+div[data-testid="stMetricLabel"] {
+    color: #fafafa;
+}
+"""
+
+# Theme selector in sidebar
+def apply_theme():
+    theme = st.sidebar.selectbox(
+        "🎨 Choose Theme",
+        ["Light Theme", "Dark Theme"],
+        help="Select your preferred theme"
+    )
+    
+    # Emit all styles as a single element. It has to be re-sent on every
+    # rerun: Streamlit removes elements a run does not redraw.
+    css = BASE_CSS + DARK_THEME_CSS if theme == "Dark Theme" else BASE_CSS
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+    
+    return theme
+
+# Apply theme
+current_theme = apply_theme()
+
+@st.cache_resource(ttl=3600)
+def get_vaccination_data():
+    """Load the shared, read-only dataset with its status messages and a unique version stamp."""
+    df, messages = data_loader.load_vaccination_data()
+    if df is not None:
+        df = df.copy()
+    return df, messages, time.time_ns()
+
+def show_messages(messages):
+    """Render the ``(level, text)`` status messages returned by the data loaders."""
+    for level, text in messages:
+        getattr(st, level)(text)
+
+@st.cache_data(ttl=3600)
+def read_uploaded_file(file_name, file_size, _uploaded_file):
+    """Parse an uploaded dataset, keyed on its name and size rather than its bytes."""
+    if file_name.endswith('.csv'):
+        return pd.read_csv(_uploaded_file)
+    try:
+        # The Rust-backed calamine reader is much faster than openpyxl/xlrd
+        return pd.read_excel(_uploaded_file, engine='calamine')
+    except ImportError:
+        # python-calamine is optional; fall back to pandas' default engine
+        _uploaded_file.seek(0)
+        return pd.read_excel(_uploaded_file)
+
+# The cached helpers below receive the frame main() loaded as
+# ``_vaccination_data``; the leading underscore keeps Streamlit from hashing
+# it, and ``dataset_version`` ties each entry to that load instead
+@st.cache_resource(ttl=3600)
+def get_district_partitions(_vaccination_data, dataset_version):
+    """Split the shared dataset into one read-only frame per district."""
+    return {
+        name: frame
+        for name, frame in _vaccination_data.groupby('district', observed=True, sort=False)
+    }
+
+@st.cache_resource(ttl=3600)
+def get_sidebar_options(_vaccination_data, dataset_version):
+    """Build the sidebar filter choices once per loaded dataset."""
+    return {
+        'districts': ['All'] + list(_vaccination_data['district'].cat.categories),
+        'vaccines': ['All'] + list(_vaccination_data['vaccine_type'].cat.categories),
+        'age_groups': ['All'] + list(_vaccination_data['age_group'].cat.categories),
+        'min_date': _vaccination_data['date'].min().date(),
+        'max_date': _vaccination_data['date'].max().date()
+    }
+
+@st.cache_resource(ttl=3600, max_entries=8)
+def filter_data(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender):
+    """Apply the sidebar filters to the loaded dataset; the shared slice must not be modified."""
+    vaccination_data = _vaccination_data
+    if district != 'All':
+        vaccination_data = get_district_partitions(_vaccination_data, dataset_version).get(district, _vaccination_data.iloc[0:0])
+        district = 'All'
+    return utils.apply_filters(vaccination_data, district, vaccine, date_range, age_group, gender)
+
+@st.cache_data(ttl=3600)
+def get_coverage_aggregates(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender):
+    """Coverage sum and count per (district, vaccine_type), keeping missing labels as groups."""
+    filtered_data = filter_data(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender)
+    return filtered_data.groupby(['district', 'vaccine_type'], observed=True, dropna=False)['coverage_percentage'].agg(['sum', 'count'])
+
+def coverage_mean_by(aggregates, level):
+    """Roll the (district, vaccine_type) aggregates up to mean coverage per ``level``."""
+    totals = aggregates.groupby(level=level, observed=True).sum()
+    return totals['sum'] / totals['count']
+
+@st.cache_data(ttl=3600)
+def get_kpis(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender):
+    """Compute the headline KPI values for a filter combination."""
+    filtered_data = filter_data(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender)
+    aggregates = get_coverage_aggregates(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender)
+    total_children = len(filtered_data)
+    fully_vaccinated = int(filtered_data['fully_vaccinated'].to_numpy().sum())
+    return {
+        'total_children': total_children,
+        'avg_coverage': coverage_mean_by(aggregates, 'vaccine_type').mean(),
+        'fully_vaccinated_pct': (fully_vaccinated / total_children) * 100 if total_children > 0 else 0,
+        'districts_covered': aggregates.index.get_level_values('district').nunique()
+    }
+
+@st.cache_data(ttl=3600)
+def get_district_coverage(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender):
+    """Average coverage per district for a filter combination, lowest first."""
+    aggregates = get_coverage_aggregates(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender)
+    district_coverage = coverage_mean_by(aggregates, 'district').reset_index(name='coverage_percentage')
+    return district_coverage.sort_values('coverage_percentage', ascending=True)
+
+@st.cache_data(ttl=3600)
+def run_report(_vaccination_data, dataset_version, report_name, district, vaccine, date_range, age_group, gender):
+    """Run a ``utils`` report helper on the filtered data, cached per filter combination."""
+    filtered_data = filter_data(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender)
+    return getattr(utils, report_name)(filtered_data)
+
+@st.cache_data(ttl=3600, max_entries=8)
+def build_export(_vaccination_data, dataset_version, export_name, district, vaccine, date_range, age_group, gender):
+    """Build a download payload once per filter combination, reusing the cached summary tables."""
+    filters = (district, vaccine, date_range, age_group, gender)
+    filtered_data = filter_data(_vaccination_data, dataset_version, *filters)
+    if export_name == 'prepare_csv_export':
+        return utils.prepare_csv_export(filtered_data)
+    
+    summary_stats = run_report(_vaccination_data, dataset_version, 'get_summary_statistics', *filters)
+    district_summary = run_report(_vaccination_data, dataset_version, 'get_district_summary', *filters)
+    if export_name == 'prepare_excel_export':
+        return utils.prepare_excel_export(filtered_data, summary_stats, district_summary)
+    recommendations = run_report(_vaccination_data, dataset_version, 'generate_recommendations', *filters)
+    return utils.prepare_pdf_report(filtered_data, summary_stats, district_summary, recommendations)
+
+@st.cache_data(ttl=3600)
+def get_vaccine_stats(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender):
+    """Per-vaccine coverage statistics shared by the vaccine charts."""
+    filtered_data = filter_data(_vaccination_data, dataset_version, district, vaccine, date_range, age_group, gender)
+    return visualization.get_vaccine_stats(filtered_data)
+
+# Charts that take the shared per-vaccine statistics
+VACCINE_STATS_CHARTS = {'create_vaccine_coverage_chart', 'create_vaccine_comparison_chart'}
+
+# Room for the dashboard's eight charts across the eight filter combinations
+# filter_data keeps
+@st.cache_resource(ttl=3600, max_entries=64)
+def build_chart(_vaccination_data, dataset_version, chart_name, district, vaccine, date_range, age_group, gender):
+    """Build a ``visualization`` figure once per filter combination; callers must not modify it."""
+    filters = (district, vaccine, date_range, age_group, gender)
+    filtered_data = filter_data(_vaccination_data, dataset_version, *filters)
+    create_chart = getattr(visualization, chart_name)
+    if chart_name in VACCINE_STATS_CHARTS:
+        return create_chart(filtered_data, vaccine_stats=get_vaccine_stats(_vaccination_data, dataset_version, *filters))
+    return create_chart(filtered_data)
+
+def export_requested(export_name, label, filters):
+    """Show a prepare button and report whether this export was requested for ``filters``."""
+    requested = st.session_state.setdefault('requested_exports', set())
+    if st.button(label, key=f"prepare_{export_name}"):
+        requested.add((export_name, filters))
+    return (export_name, filters) in requested
 
 def main():
     st.title("🏥 Childhood Vaccination Coverage Dashboard - Rural Punjab")
@@ -89,9 +226,16 @@ def main():
     
     # Try to load data
     try:
-        vaccination_data = data_loader.load_vaccination_data()
+        vaccination_data, load_messages, dataset_version = get_vaccination_data()
+        # Report the load once per session rather than on every rerun that
+        # reuses the cached dataset
+        if st.session_state.get('shown_dataset_version') != dataset_version:
+            show_messages(load_messages)
+            st.session_state['shown_dataset_version'] = dataset_version
         
         if vaccination_data is None or vaccination_data.empty:
+            # Do not keep a failed load; the next rerun tries the sources again
+            get_vaccination_data.clear()
             st.error("❌ **No vaccination data available**")
             st.markdown("""
             **To connect to authentic vaccination data sources:**
@@ -118,10 +262,9 @@ def main():
             
             if uploaded_file is not None:
                 try:
-                    if uploaded_file.name.endswith('.csv'):
-                        uploaded_data = pd.read_csv(uploaded_file)
-                    else:
-                        uploaded_data = pd.read_excel(uploaded_file)
+                    uploaded_data = read_uploaded_file(
+                        uploaded_file.name, uploaded_file.size, uploaded_file
+                    )
                     
                     st.success(f"✅ Successfully loaded {len(uploaded_data)} records from {uploaded_file.name}")
                     
@@ -133,9 +276,14 @@ def main():
                         st.error(f"Missing required columns: {missing_cols}")
                         st.info("Please ensure your data includes at least: district, vaccine_type, coverage_percentage")
                     else:
-                        # Save uploaded data and reload
-                        uploaded_data.to_csv('vaccination_data.csv', index=False)
-                        st.rerun()
+                        # Save the cleaned upload and reload
+                        cleaned_data = data_loader.validate_and_clean_data(uploaded_data)
+                        if not cleaned_data.empty:
+                            data_loader.save_cleaned_data(cleaned_data)
+                            # Drop every cached view of the old dataset
+                            st.cache_resource.clear()
+                            st.cache_data.clear()
+                            st.rerun()
                         
                 except Exception as e:
                     st.error(f"Error processing uploaded file: {str(e)}")
@@ -143,15 +291,16 @@ def main():
             return
             
         # Data filters in sidebar
-        districts = ['All'] + sorted(vaccination_data['district'].unique().tolist())
+        options = get_sidebar_options(vaccination_data, dataset_version)
+        districts = options['districts']
         selected_district = st.sidebar.selectbox("🏘️ Select District", districts)
         
-        vaccines = ['All'] + sorted(vaccination_data['vaccine_type'].unique().tolist())
+        vaccines = options['vaccines']
         selected_vaccine = st.sidebar.selectbox("💉 Select Vaccine Type", vaccines)
         
         # Date range filter
-        min_date = vaccination_data['date'].min().date()
-        max_date = vaccination_data['date'].max().date()
+        min_date = options['min_date']
+        max_date = options['max_date']
         
         date_range = st.sidebar.date_input(
             "📅 Select Date Range",
@@ -161,7 +310,7 @@ def main():
         )
         
         # Age group filter
-        age_groups = ['All'] + sorted(vaccination_data['age_group'].unique().tolist())
+        age_groups = options['age_groups']
         selected_age_group = st.sidebar.selectbox("👶 Select Age Group", age_groups)
         
         # Gender filter
@@ -169,14 +318,14 @@ def main():
         selected_gender = st.sidebar.selectbox("👥 Select Gender", genders)
         
         # Apply filters
-        filtered_data = utils.apply_filters(
-            vaccination_data, 
+        filters = (
             selected_district, 
             selected_vaccine, 
-            date_range, 
+            tuple(date_range), 
             selected_age_group, 
             selected_gender
         )
+        filtered_data = filter_data(vaccination_data, dataset_version, *filters)
         
         if filtered_data.empty:
             st.warning("⚠️ No data matches the selected filters. Please adjust your filter criteria.")
@@ -186,9 +335,10 @@ def main():
         st.header("📈 Key Performance Indicators")
         
         col1, col2, col3, col4 = st.columns(4)
+        kpis = get_kpis(vaccination_data, dataset_version, *filters)
         
         with col1:
-            total_children = len(filtered_data)
+            total_children = kpis['total_children']
             st.metric(
                 label="📊 Total Children Tracked",
                 value=f"{total_children:,}",
@@ -196,7 +346,7 @@ def main():
             )
         
         with col2:
-            avg_coverage = filtered_data.groupby('vaccine_type')['coverage_percentage'].mean().mean()
+            avg_coverage = kpis['avg_coverage']
             st.metric(
                 label="💉 Average Coverage",
                 value=f"{avg_coverage:.1f}%",
@@ -205,8 +355,7 @@ def main():
             )
         
         with col3:
-            fully_vaccinated = len(filtered_data[filtered_data['fully_vaccinated'] == True])
-            fully_vaccinated_pct = (fully_vaccinated / total_children) * 100 if total_children > 0 else 0
+            fully_vaccinated_pct = kpis['fully_vaccinated_pct']
             st.metric(
                 label="✅ Fully Vaccinated",
                 value=f"{fully_vaccinated_pct:.1f}%",
@@ -215,7 +364,7 @@ def main():
             )
         
         with col4:
-            districts_covered = filtered_data['district'].nunique()
+            districts_covered = kpis['districts_covered']
             st.metric(
                 label="🏘️ Districts Covered",
                 value=f"{districts_covered}",
@@ -224,7 +373,10 @@ def main():
         
         # Alert for low coverage areas
         low_coverage_threshold = 70
-        low_coverage_districts = utils.get_low_coverage_areas(filtered_data, low_coverage_threshold)
+        district_coverage = get_district_coverage(vaccination_data, dataset_version, *filters)
+        low_coverage_districts = district_coverage[
+            district_coverage['coverage_percentage'] < low_coverage_threshold
+        ]
         
         if not low_coverage_districts.empty:
             st.markdown("""
@@ -233,8 +385,10 @@ def main():
             </div>
             """, unsafe_allow_html=True)
             
-            for _, district in low_coverage_districts.iterrows():
-                st.warning(f"📍 **{district['district']}**: {district['coverage_percentage']:.1f}% coverage")
+            st.warning("\n".join(
+                f"- 📍 **{district}**: {coverage:.1f}% coverage"
+                for district, coverage in low_coverage_districts.itertuples(index=False)
+            ))
         
         # Main dashboard content
         tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -249,9 +403,6 @@ def main():
             st.header("🗺️ Geographic Vaccination Coverage")
             
             # Create geographic visualization using charts instead of problematic map
-            district_coverage = filtered_data.groupby('district')['coverage_percentage'].mean().reset_index()
-            district_coverage = district_coverage.sort_values('coverage_percentage', ascending=True)
-            
             # Create horizontal bar chart showing district coverage with color coding
             fig_geo = px.bar(
                 district_coverage, 
@@ -281,7 +432,7 @@ def main():
             
             # District-wise coverage table
             st.subheader("📋 District-wise Coverage Summary")
-            district_summary = utils.get_district_summary(filtered_data)
+            district_summary = run_report(vaccination_data, dataset_version, 'get_district_summary', *filters)
             st.dataframe(
                 district_summary,
                 use_container_width=True,
@@ -296,18 +447,18 @@ def main():
             with col1:
                 # Vaccine-wise coverage chart
                 st.subheader("💉 Coverage by Vaccine Type")
-                vaccine_chart = visualization.create_vaccine_coverage_chart(filtered_data)
+                vaccine_chart = build_chart(vaccination_data, dataset_version, 'create_vaccine_coverage_chart', *filters)
                 st.plotly_chart(vaccine_chart, use_container_width=True, key="vaccine_coverage_chart")
             
             with col2:
                 # Coverage distribution
                 st.subheader("📈 Coverage Distribution")
-                distribution_chart = visualization.create_coverage_distribution(filtered_data)
+                distribution_chart = build_chart(vaccination_data, dataset_version, 'create_coverage_distribution', *filters)
                 st.plotly_chart(distribution_chart, use_container_width=True, key="coverage_distribution_chart")
             
             # Detailed vaccine comparison
             st.subheader("🔍 Detailed Vaccine Comparison")
-            comparison_chart = visualization.create_vaccine_comparison_chart(filtered_data)
+            comparison_chart = build_chart(vaccination_data, dataset_version, 'create_vaccine_comparison_chart', *filters)
             st.plotly_chart(comparison_chart, use_container_width=True, key="vaccine_comparison_chart")
         
         with tab3:
@@ -315,7 +466,7 @@ def main():
             
             # Time series analysis
             st.subheader("📅 Coverage Trends Over Time")
-            timeline_chart = visualization.create_timeline_chart(filtered_data)
+            timeline_chart = build_chart(vaccination_data, dataset_version, 'create_timeline_chart', *filters)
             st.plotly_chart(timeline_chart, use_container_width=True, key="timeline_chart")
             
             col1, col2 = st.columns(2)
@@ -323,13 +474,13 @@ def main():
             with col1:
                 # Monthly vaccination counts
                 st.subheader("📊 Monthly Vaccination Activity")
-                monthly_chart = visualization.create_monthly_activity_chart(filtered_data)
+                monthly_chart = build_chart(vaccination_data, dataset_version, 'create_monthly_activity_chart', *filters)
                 st.plotly_chart(monthly_chart, use_container_width=True, key="monthly_chart")
             
             with col2:
                 # Seasonal patterns
                 st.subheader("🌡️ Seasonal Vaccination Patterns")
-                seasonal_chart = visualization.create_seasonal_pattern_chart(filtered_data)
+                seasonal_chart = build_chart(vaccination_data, dataset_version, 'create_seasonal_pattern_chart', *filters)
                 st.plotly_chart(seasonal_chart, use_container_width=True, key="seasonal_chart")
         
         with tab4:
@@ -340,18 +491,18 @@ def main():
             with col1:
                 # Age group analysis
                 st.subheader("👶 Coverage by Age Group")
-                age_chart = visualization.create_age_group_chart(filtered_data)
+                age_chart = build_chart(vaccination_data, dataset_version, 'create_age_group_chart', *filters)
                 st.plotly_chart(age_chart, use_container_width=True, key="age_group_chart")
             
             with col2:
                 # Gender analysis
                 st.subheader("👦👧 Coverage by Gender")
-                gender_chart = visualization.create_gender_chart(filtered_data)
+                gender_chart = build_chart(vaccination_data, dataset_version, 'create_gender_chart', *filters)
                 st.plotly_chart(gender_chart, use_container_width=True, key="gender_chart")
             
             # Combined demographic analysis
             st.subheader("🔍 Detailed Demographic Breakdown")
-            demographic_table = utils.get_demographic_analysis(filtered_data)
+            demographic_table = run_report(vaccination_data, dataset_version, 'get_demographic_analysis', *filters)
             st.dataframe(demographic_table, use_container_width=True)
         
         with tab5:
@@ -359,7 +510,7 @@ def main():
             
             # Summary statistics
             st.subheader("📊 Summary Statistics")
-            summary_stats = utils.get_summary_statistics(filtered_data)
+            summary_stats = run_report(vaccination_data, dataset_version, 'get_summary_statistics', *filters)
             
             col1, col2 = st.columns(2)
             with col1:
@@ -369,7 +520,7 @@ def main():
             
             # Action items and recommendations
             st.subheader("🎯 Action Items & Recommendations")
-            recommendations = utils.generate_recommendations(filtered_data)
+            recommendations = run_report(vaccination_data, dataset_version, 'generate_recommendations', *filters)
             for i, rec in enumerate(recommendations, 1):
                 st.markdown(f"**{i}.** {rec}")
             
@@ -380,54 +531,58 @@ def main():
             
             with col1:
                 st.markdown("**📥 CSV Export**")
-                csv_data = utils.prepare_csv_export(filtered_data)
-                st.download_button(
-                    label="Download CSV Data",
-                    data=csv_data,
-                    file_name=f"vaccination_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv",
-                    help="Download filtered vaccination data as CSV file"
-                )
+                if export_requested('csv', "Prepare CSV Data", filters):
+                    csv_data = build_export(vaccination_data, dataset_version, 'prepare_csv_export', *filters)
+                    st.download_button(
+                        label="Download CSV Data",
+                        data=csv_data,
+                        file_name=f"vaccination_data_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv",
+                        help="Download filtered vaccination data as CSV file"
+                    )
             
             with col2:
                 st.markdown("**📊 Excel Export**")
-                excel_data = utils.prepare_excel_export(filtered_data)
-                if excel_data:
-                    st.download_button(
-                        label="Download Excel Report",
-                        data=excel_data,
-                        file_name=f"vaccination_report_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        help="Download comprehensive report with multiple sheets in Excel format"
-                    )
-                else:
-                    st.error("Failed to generate Excel file")
+                if export_requested('excel', "Prepare Excel Report", filters):
+                    excel_data = build_export(vaccination_data, dataset_version, 'prepare_excel_export', *filters)
+                    if excel_data:
+                        st.download_button(
+                            label="Download Excel Report",
+                            data=excel_data,
+                            file_name=f"vaccination_report_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            help="Download comprehensive report with multiple sheets in Excel format"
+                        )
+                    else:
+                        st.error("Failed to generate Excel file")
             
             with col3:
                 st.markdown("**📄 PDF Report**")
-                pdf_data = utils.prepare_pdf_report(filtered_data)
-                if pdf_data:
-                    st.download_button(
-                        label="Download PDF Report",
-                        data=pdf_data,
-                        file_name=f"vaccination_report_{datetime.now().strftime('%Y%m%d')}.pdf",
-                        mime="application/pdf",
-                        help="Download professional PDF report with charts and analysis"
-                    )
-                else:
-                    st.error("Failed to generate PDF report")
+                if export_requested('pdf', "Prepare PDF Report", filters):
+                    pdf_data = build_export(vaccination_data, dataset_version, 'prepare_pdf_report', *filters)
+                    if pdf_data:
+                        st.download_button(
+                            label="Download PDF Report",
+                            data=pdf_data,
+                            file_name=f"vaccination_report_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            mime="application/pdf",
+                            help="Download professional PDF report with charts and analysis"
+                        )
+                    else:
+                        st.error("Failed to generate PDF report")
             
             # Additional export options
             st.markdown("---")
             st.subheader("📋 Text Summary")
-            summary_report = utils.generate_summary_report(filtered_data)
-            st.download_button(
-                label="Download Text Summary",
-                data=summary_report,
-                file_name=f"vaccination_summary_{datetime.now().strftime('%Y%m%d')}.txt",
-                mime="text/plain",
-                help="Download concise text summary report"
-            )
+            if export_requested('summary', "Prepare Text Summary", filters):
+                summary_report = utils.generate_summary_report(filtered_data, run_report(vaccination_data, dataset_version, 'generate_recommendations', *filters))
+                st.download_button(
+                    label="Download Text Summary",
+                    data=summary_report,
+                    file_name=f"vaccination_summary_{datetime.now().strftime('%Y%m%d')}.txt",
+                    mime="text/plain",
+                    help="Download concise text summary report"
+                )
     
     except Exception as e:
         st.error(f"❌ **Application Error**: {str(e)}")
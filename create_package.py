@@ -6,8 +6,19 @@ Creates a comprehensive ZIP package with all files and documentation
 
 import os
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+def read_package_file(file_path):
+    """Read a file for the package, returning its zip entry info and contents."""
+    if not os.path.exists(file_path):
+        return file_path, None, None
+    
+    zip_info = zipfile.ZipInfo.from_file(file_path)
+    zip_info.compress_type = zipfile.ZIP_DEFLATED
+    with open(file_path, 'rb') as f:
+        return file_path, zip_info, f.read()
+
 def create_vaccination_dashboard_package():
     """Create a complete package for the vaccination dashboard."""
     
@@ -33,22 +44,26 @@ def create_vaccination_dashboard_package():
     
     print(f"🚀 Creating vaccination dashboard package: {package_name}")
     
-    with zipfile.ZipFile(package_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(package_name, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zipf:
+        # Read project files concurrently; entries are written serially
+        # because a ZipFile only accepts one writer at a time
+        with ThreadPoolExecutor() as executor:
+            package_files = list(executor.map(read_package_file, files_to_include))
+        
         # Add main project files
-        for file_path in files_to_include:
-            if os.path.exists(file_path):
-                zipf.write(file_path)
+        for file_path, zip_info, contents in package_files:
+            if zip_info is not None:
+                zipf.writestr(zip_info, contents, compresslevel=9)
                 print(f"✅ Added: {file_path}")
             else:
                 print(f"⚠️  Skipped (not found): {file_path}")
         
         # Create requirements.txt for pip users
         requirements_content = """streamlit>=1.28.0
-pandas>=2.0.0
+pandas>=2.2
 numpy>=1.24.0
 plotly>=5.15.0
 folium>=0.14.0
-streamlit-folium>=0.13.0
 requests>=2.31.0
 openpyxl>=3.1.0
 xlsxwriter>=3.1.0
@@ -1,38 +1,56 @@
 import pandas as pd
 import numpy as np
+import re
 from datetime import datetime, timedelta
 import streamlit as st
 
+# Markdown bold markers and emoji stripped from recommendations in plain-text
+# and PDF reports
+REPORT_MARKUP_PATTERN = re.compile("|".join(
+    re.escape(token) for token in ["**", "🚨", "⚠️", "📍", "👥", "💉", "📅", "👶", "✅"]
+))
+
 def apply_filters(df, district, vaccine, date_range, age_group, gender):
-    """Apply selected filters to the dataframe."""
+    """Apply selected filters to the dataframe.
+
+    When no row is filtered out ``df`` itself is returned, so treat the
+    result as read-only.
+    """
     try:
-        filtered_df = df.copy()
+        # Fuse every active predicate into one boolean mask and slice once,
+        # instead of materialising an intermediate frame per filter
+        mask = np.ones(len(df), dtype=bool)
         
         # District filter
         if district != 'All':
-            filtered_df = filtered_df[filtered_df['district'] == district]
+            mask &= (df['district'] == district).to_numpy()
         
         # Vaccine filter
         if vaccine != 'All':
-            filtered_df = filtered_df[filtered_df['vaccine_type'] == vaccine]
+            mask &= (df['vaccine_type'] == vaccine).to_numpy()
         
         # Date range filter
         if len(date_range) == 2:
             start_date, end_date = date_range
-            filtered_df = filtered_df[
-                (filtered_df['date'].dt.date >= start_date) & 
-                (filtered_df['date'].dt.date <= end_date)
-            ]
+            # Compare raw datetime64 values against [start, end + 1 day)
+            # rather than building datetime.date objects per row
+            dates = df['date'].to_numpy()
+            mask &= dates >= pd.Timestamp(start_date).to_datetime64()
+            mask &= dates < (pd.Timestamp(end_date) + pd.Timedelta(days=1)).to_datetime64()
         
         # Age group filter
         if age_group != 'All':
-            filtered_df = filtered_df[filtered_df['age_group'] == age_group]
+            mask &= (df['age_group'] == age_group).to_numpy()
         
         # Gender filter
         if gender != 'All':
-            filtered_df = filtered_df[filtered_df['gender'] == gender]
+            mask &= (df['gender'] == gender).to_numpy()
         
-        return filtered_df
+        # The default selection (everything, full date span) keeps every
+        # row; skip the gather in that case
+        if mask.all():
+            return df
+        return df[mask]
         
     except Exception as e:
         st.error(f"Error applying filters: {str(e)}")
@@ -41,7 +59,7 @@ def apply_filters(df, district, vaccine, date_range, age_group, gender):
 def get_low_coverage_areas(df, threshold=70):
     """Identify areas with coverage below the specified threshold."""
     try:
-        district_coverage = df.groupby('district')['coverage_percentage'].mean().reset_index()
+        district_coverage = df.groupby('district', observed=True)['coverage_percentage'].mean().reset_index()
         low_coverage = district_coverage[district_coverage['coverage_percentage'] < threshold]
         return low_coverage.sort_values('coverage_percentage')
         
@@ -52,19 +70,18 @@ def get_low_coverage_areas(df, threshold=70):
 def get_district_summary(df):
     """Generate a summary table by district."""
     try:
-        summary = df.groupby('district').agg({
-            'coverage_percentage': ['mean', 'min', 'max', 'std'],
-            'child_id': 'nunique',
-            'vaccine_type': 'nunique',
-            'village': 'nunique'
+        # Named aggregations produce flat columns directly; the sort below
+        # orders the rows, so the group keys need not be sorted
+        summary = df.groupby('district', observed=True, sort=False).agg(**{
+            'Avg Coverage (%)': ('coverage_percentage', 'mean'),
+            'Min Coverage (%)': ('coverage_percentage', 'min'),
+            'Max Coverage (%)': ('coverage_percentage', 'max'),
+            'Std Dev (%)': ('coverage_percentage', 'std'),
+            'Children Tracked': ('child_id', 'nunique'),
+            'Vaccines Administered': ('vaccine_type', 'nunique'),
+            'Villages Covered': ('village', 'nunique')
         }).round(2)
         
-        # Flatten column names
-        summary.columns = [
-            'Avg Coverage (%)', 'Min Coverage (%)', 'Max Coverage (%)', 
-            'Std Dev (%)', 'Children Tracked', 'Vaccines Administered', 'Villages Covered'
-        ]
-        
         summary = summary.reset_index()
         summary = summary.sort_values('Avg Coverage (%)', ascending=False)
         
@@ -77,13 +94,13 @@ def get_district_summary(df):
 def get_demographic_analysis(df):
     """Generate demographic analysis table."""
     try:
-        demographic_summary = df.groupby(['age_group', 'gender']).agg({
-            'coverage_percentage': 'mean',
-            'child_id': 'nunique',
-            'fully_vaccinated': lambda x: (x == True).sum()
+        # fully_vaccinated is boolean, so the built-in sum counts it
+        demographic_summary = df.groupby(['age_group', 'gender'], observed=True).agg(**{
+            'Avg Coverage (%)': ('coverage_percentage', 'mean'),
+            'Children Count': ('child_id', 'nunique'),
+            'Fully Vaccinated': ('fully_vaccinated', 'sum')
         }).round(2)
         
-        demographic_summary.columns = ['Avg Coverage (%)', 'Children Count', 'Fully Vaccinated']
         demographic_summary = demographic_summary.reset_index()
         
         # Calculate fully vaccinated percentage
@@ -100,23 +117,29 @@ def get_demographic_analysis(df):
 def get_summary_statistics(df):
     """Generate comprehensive summary statistics."""
     try:
+        coverage = df['coverage_percentage'].agg(['mean', 'median', 'min', 'max', 'std'])
+        # A district counts as above 90 / below 70 when any of its records is,
+        # which its highest / lowest coverage answers in one grouped pass
+        district_range = df.groupby('district', observed=True)['coverage_percentage'].agg(['min', 'max'])
+        gender_children = df.groupby('gender', observed=True)['child_id'].nunique()
+        
         coverage_stats = {
-            "overall_coverage": df['coverage_percentage'].mean(),
-            "median_coverage": df['coverage_percentage'].median(),
-            "min_coverage": df['coverage_percentage'].min(),
-            "max_coverage": df['coverage_percentage'].max(),
-            "std_coverage": df['coverage_percentage'].std(),
-            "districts_above_90": len(df[df['coverage_percentage'] >= 90]['district'].unique()),
-            "districts_below_70": len(df[df['coverage_percentage'] < 70]['district'].unique())
+            "overall_coverage": coverage['mean'],
+            "median_coverage": coverage['median'],
+            "min_coverage": coverage['min'],
+            "max_coverage": coverage['max'],
+            "std_coverage": coverage['std'],
+            "districts_above_90": int((district_range['max'] >= 90).sum()),
+            "districts_below_70": int((district_range['min'] < 70).sum())
         }
         
         demographic_stats = {
             "total_children": df['child_id'].nunique(),
             "total_districts": df['district'].nunique(),
             "total_villages": df['village'].nunique(),
-            "male_children": len(df[df['gender'] == 'Male']['child_id'].unique()),
-            "female_children": len(df[df['gender'] == 'Female']['child_id'].unique()),
-            "fully_vaccinated_count": len(df[df['fully_vaccinated'] == True]['child_id'].unique())
+            "male_children": int(gender_children.get('Male', 0)),
+            "female_children": int(gender_children.get('Female', 0)),
+            "fully_vaccinated_count": df.loc[df['fully_vaccinated'] == True, 'child_id'].nunique()
         }
         
         return {
@@ -128,6 +151,19 @@ def get_summary_statistics(df):
         st.error(f"Error generating summary statistics: {str(e)}")
         return {"coverage_stats": {}, "demographic_stats": {}}
 
+def get_coverage_means(df, columns):
+    """Mean coverage per value of each of ``columns`` from a single groupby pass.
+
+    Sums and counts are taken once over the combined keys and rolled up per
+    column, instead of grouping the full frame once per column.
+    """
+    aggregates = df.groupby(columns, observed=True, dropna=False)['coverage_percentage'].agg(['sum', 'count'])
+    means = {}
+    for column in columns:
+        totals = aggregates.groupby(level=column, observed=True).sum()
+        means[column] = totals['sum'] / totals['count']
+    return means
+
 def generate_recommendations(df):
     """Generate actionable recommendations based on data analysis."""
     try:
@@ -144,25 +180,29 @@ def generate_recommendations(df):
                 f"⚠️ **Action Needed**: Overall coverage is {avg_coverage:.1f}%. Focus on improving coverage to reach WHO targets."
             )
         
+        coverage_means = get_coverage_means(df, ['district', 'gender', 'vaccine_type', 'month', 'age_group'])
+        
         # Identify low-performing districts
-        low_coverage_districts = get_low_coverage_areas(df, 70)
+        district_coverage = coverage_means['district']
+        low_coverage_districts = district_coverage[district_coverage < 70].sort_values()
         if not low_coverage_districts.empty:
-            district_list = ", ".join(low_coverage_districts['district'].head(3).tolist())
+            district_list = ", ".join(low_coverage_districts.index[:3].tolist())
             recommendations.append(
                 f"📍 **Priority Districts**: Focus resources on {district_list} - these areas have critically low coverage."
             )
         
         # Gender disparities
-        gender_analysis = df.groupby('gender')['coverage_percentage'].mean()
+        gender_analysis = coverage_means['gender']
         if len(gender_analysis) >= 2:
-            gender_diff = abs(gender_analysis.iloc[0] - gender_analysis.iloc[1])
+            # Widest gap between any two recorded genders
+            gender_diff = gender_analysis.max() - gender_analysis.min()
             if gender_diff > 10:
                 recommendations.append(
                     f"👥 **Gender Equity**: Address {gender_diff:.1f}% coverage gap between genders through targeted outreach."
                 )
         
         # Vaccine-specific issues
-        vaccine_coverage = df.groupby('vaccine_type')['coverage_percentage'].mean()
+        vaccine_coverage = coverage_means['vaccine_type']
         low_vaccine = vaccine_coverage[vaccine_coverage < 75]
         if not low_vaccine.empty:
             vaccine_list = ", ".join(low_vaccine.index.tolist())
@@ -171,7 +211,7 @@ def generate_recommendations(df):
             )
         
         # Seasonal patterns
-        monthly_coverage = df.groupby('month')['coverage_percentage'].mean()
+        monthly_coverage = coverage_means['month']
         if len(monthly_coverage) > 1:
             low_months = monthly_coverage[monthly_coverage < monthly_coverage.mean() - 5]
             if not low_months.empty:
@@ -181,7 +221,7 @@ def generate_recommendations(df):
                 )
         
         # Age group analysis
-        age_coverage = df.groupby('age_group')['coverage_percentage'].mean()
+        age_coverage = coverage_means['age_group']
         low_age_groups = age_coverage[age_coverage < 80]
         if not low_age_groups.empty:
             age_list = ", ".join(low_age_groups.index.tolist())
@@ -207,78 +247,44 @@ def prepare_csv_export(df):
             'age_group', 'gender', 'coverage_percentage', 'fully_vaccinated'
         ]
         
-        export_df = df[export_columns].copy()
-        export_df['date'] = export_df['date'].dt.strftime('%Y-%m-%d')
-        
-        return export_df.to_csv(index=False)
+        # Selecting columns and formatting dates inside to_csv avoids copying
+        # the frame and a per-row strftime pass
+        return df.to_csv(columns=export_columns, index=False, date_format='%Y-%m-%d')
         
     except Exception as e:
         st.error(f"Error preparing CSV export: {str(e)}")
         return ""
 
-def prepare_excel_export(df):
+def prepare_excel_export(df, summary_stats=None, district_summary=None):
     """Prepare filtered data for Excel export with multiple sheets."""
     try:
         from io import BytesIO
-        import xlsxwriter
         
         output = BytesIO()
-        workbook = xlsxwriter.Workbook(output)
-        
-        # Main data sheet
-        worksheet1 = workbook.add_worksheet('Vaccination Data')
         export_columns = [
             'district', 'village', 'child_id', 'vaccine_type', 'date',
             'age_group', 'gender', 'coverage_percentage', 'fully_vaccinated'
         ]
         
-        export_df = df[export_columns].copy()
-        export_df['date'] = export_df['date'].dt.strftime('%Y-%m-%d')
-        
-        # Write headers
-        for col, header in enumerate(export_df.columns):
-            worksheet1.write(0, col, header)
-        
-        # Write data
-        for row, data in enumerate(export_df.values, 1):
-            for col, value in enumerate(data):
-                worksheet1.write(row, col, value)
-        
-        # Summary sheet
-        worksheet2 = workbook.add_worksheet('Summary Statistics')
-        summary_stats = get_summary_statistics(df)
-        
-        row = 0
-        worksheet2.write(row, 0, "Coverage Statistics")
-        row += 1
-        for key, value in summary_stats['coverage_stats'].items():
-            worksheet2.write(row, 0, key)
-            worksheet2.write(row, 1, value)
-            row += 1
-        
-        row += 1
-        worksheet2.write(row, 0, "Demographic Statistics")
-        row += 1
-        for key, value in summary_stats['demographic_stats'].items():
-            worksheet2.write(row, 0, key)
-            worksheet2.write(row, 1, value)
-            row += 1
-        
-        # District summary sheet
-        worksheet3 = workbook.add_worksheet('District Summary')
-        district_summary = get_district_summary(df)
-        
-        # Write headers
-        for col, header in enumerate(district_summary.columns):
-            worksheet3.write(0, col, header)
-        
-        # Write data
-        for row, data in enumerate(district_summary.values, 1):
-            for col, value in enumerate(data):
-                worksheet3.write(row, col, value)
-        
-        workbook.close()
-        output.seek(0)
+        # Sheets are written in bulk through pandas; xlsxwriter formats the
+        # datetime cells itself, so no per-row strftime is needed
+        with pd.ExcelWriter(output, engine='xlsxwriter', datetime_format='yyyy-mm-dd') as writer:
+            # Main data sheet
+            df.to_excel(writer, sheet_name='Vaccination Data', columns=export_columns, index=False)
+            
+            # Summary sheet
+            if summary_stats is None:
+                summary_stats = get_summary_statistics(df)
+            summary_rows = [["Coverage Statistics", None]]
+            summary_rows += list(summary_stats['coverage_stats'].items())
+            summary_rows += [[None, None], ["Demographic Statistics", None]]
+            summary_rows += list(summary_stats['demographic_stats'].items())
+            pd.DataFrame(summary_rows).to_excel(writer, sheet_name='Summary Statistics', header=False, index=False)
+            
+            # District summary sheet
+            if district_summary is None:
+                district_summary = get_district_summary(df)
+            district_summary.to_excel(writer, sheet_name='District Summary', index=False)
         
         return output.getvalue()
         
@@ -286,7 +292,7 @@ def prepare_excel_export(df):
         st.error(f"Error preparing Excel export: {str(e)}")
         return None
 
-def prepare_pdf_report(df):
+def prepare_pdf_report(df, summary_stats=None, district_summary=None, recommendations=None):
     """Generate comprehensive PDF report."""
     try:
         from reportlab.lib.pagesizes import letter, A4
@@ -315,7 +321,8 @@ def prepare_pdf_report(df):
         # Executive Summary
         story.append(Paragraph("Executive Summary", styles['Heading2']))
         
-        summary_stats = get_summary_statistics(df)
+        if summary_stats is None:
+            summary_stats = get_summary_statistics(df)
         summary_text = f"""
         This report analyzes vaccination coverage data for {summary_stats['demographic_stats']['total_children']} children 
         across {summary_stats['demographic_stats']['total_districts']} districts in Punjab. 
@@ -353,16 +360,13 @@ def prepare_pdf_report(df):
         # District Performance
         story.append(Paragraph("District Performance Summary", styles['Heading2']))
         
-        district_summary = get_district_summary(df)
+        if district_summary is None:
+            district_summary = get_district_summary(df)
         district_data = [['District', 'Avg Coverage (%)', 'Children Tracked', 'Villages']]
         
-        for _, row in district_summary.head(10).iterrows():
-            district_data.append([
-                row['district'],
-                f"{row['Avg Coverage (%)']:.1f}%",
-                str(row['Children Tracked']),
-                str(row['Villages Covered'])
-            ])
+        top_districts = district_summary.head(10)[['district', 'Avg Coverage (%)', 'Children Tracked', 'Villages Covered']]
+        for district, coverage, children, villages in top_districts.itertuples(index=False, name=None):
+            district_data.append([district, f"{coverage:.1f}%", str(children), str(villages)])
         
         district_table = Table(district_data)
         district_table.setStyle(TableStyle([
@@ -380,10 +384,11 @@ def prepare_pdf_report(df):
         
         # Recommendations
         story.append(Paragraph("Recommendations", styles['Heading2']))
-        recommendations = generate_recommendations(df)
+        if recommendations is None:
+            recommendations = generate_recommendations(df)
         
         for i, rec in enumerate(recommendations, 1):
-            clean_rec = rec.replace("**", "").replace("🚨", "").replace("⚠️", "").replace("📍", "").replace("👥", "").replace("💉", "").replace("📅", "").replace("👶", "").replace("✅", "")
+            clean_rec = REPORT_MARKUP_PATTERN.sub('', rec)
             story.append(Paragraph(f"{i}. {clean_rec}", styles['Normal']))
             story.append(Spacer(1, 10))
         
@@ -397,7 +402,7 @@ def prepare_pdf_report(df):
         st.error(f"Error generating PDF report: {str(e)}")
         return None
 
-def generate_summary_report(df):
+def generate_summary_report(df, recommendations=None):
     """Generate a text-based summary report."""
     try:
         report_lines = []
@@ -418,7 +423,7 @@ def generate_summary_report(df):
         # District performance
         report_lines.append("DISTRICT PERFORMANCE")
         report_lines.append("-" * 20)
-        district_summary = df.groupby('district')['coverage_percentage'].mean().sort_values(ascending=False)
+        district_summary = df.groupby('district', observed=True)['coverage_percentage'].mean().sort_values(ascending=False)
         for district, coverage in district_summary.head(10).items():
             report_lines.append(f"{district}: {coverage:.1f}%")
         report_lines.append("")
@@ -426,10 +431,11 @@ def generate_summary_report(df):
         # Recommendations
         report_lines.append("KEY RECOMMENDATIONS")
         report_lines.append("-" * 20)
-        recommendations = generate_recommendations(df)
+        if recommendations is None:
+            recommendations = generate_recommendations(df)
         for i, rec in enumerate(recommendations, 1):
             # Remove markdown formatting for text report
-            clean_rec = rec.replace("**", "").replace("🚨", "").replace("⚠️", "").replace("📍", "").replace("👥", "").replace("💉", "").replace("📅", "").replace("👶", "").replace("✅", "")
+            clean_rec = REPORT_MARKUP_PATTERN.sub('', rec)
             report_lines.append(f"{i}. {clean_rec}")
         
         return "\n".join(report_lines)
@@ -5,8 +5,56 @@ import pandas as pd
 import folium
 import streamlit as st
 import numpy as np
+import zlib
 from datetime import datetime
 
+# Maximum points drawn per timeline series; longer series are downsampled
+MAX_TIMELINE_POINTS = 2000
+
+# Month names indexed by month number (index 0 unused)
+MONTH_NAMES = np.array([''] + [datetime(2000, month, 1).strftime('%B') for month in range(1, 13)])
+
+def _m4_indices(x, y, n_bins):
+    """Return the indices kept by M4 aggregation over ``n_bins`` equal-width x buckets.
+
+    Each bucket keeps its first, last, minimum and maximum point, so spikes
+    survive downsampling. ``x`` must be sorted ascending.
+    """
+    if len(x) <= 4 * n_bins:
+        return np.arange(len(x))
+    
+    edges = np.linspace(x[0], x[-1], n_bins + 1)
+    buckets = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_bins - 1)
+    grouped = pd.Series(y).groupby(buckets)
+    
+    return np.unique(np.concatenate([
+        grouped.head(1).index,
+        grouped.tail(1).index,
+        grouped.idxmin().to_numpy(),
+        grouped.idxmax().to_numpy()
+    ]))
+
+def downsample_timeline(timeline_data, max_points=MAX_TIMELINE_POINTS):
+    """Downsample each vaccine's date series with M4 aggregation before plotting."""
+    series = []
+    for _, group in timeline_data.groupby('vaccine_type', observed=True, sort=False):
+        if len(group) > max_points:
+            x = group['date'].to_numpy().astype('int64').astype(float)
+            y = group['coverage_percentage'].to_numpy(dtype=float)
+            group = group.iloc[_m4_indices(x, y, max_points // 4)]
+        series.append(group)
+    
+    return pd.concat(series) if series else timeline_data
+
+def district_offsets(districts):
+    """Deterministic demonstration (lat, lon) offsets in [-1, 1) for each district name.
+
+    Each offset is seeded from a CRC of the name, so a district keeps its
+    position across reruns, processes and filter changes.
+    """
+    offsets = [np.random.default_rng(zlib.crc32(str(name).encode())).uniform(-1, 1, 2) for name in districts]
+    return np.array(offsets).reshape(-1, 2)
+
 def create_coverage_map(df):
     """Create a folium map showing vaccination coverage by geographic area."""
     try:
@@ -14,45 +62,51 @@ def create_coverage_map(df):
             return None
         
         # Calculate average coverage by district
-        district_coverage = df.groupby('district').agg({
-            'coverage_percentage': 'mean',
-            'village': 'first'  # Get a representative village name
-        }).reset_index()
+        district_coverage = df.groupby('district', observed=True, sort=False)['coverage_percentage'].mean().reset_index()
         
         # Create base map centered on Punjab
         punjab_coords = [30.7333, 76.7794]  # Approximate center of Punjab
         m = folium.Map(location=punjab_coords, zoom_start=8, tiles='OpenStreetMap')
         
-        # Add markers for each district
-        for _, row in district_coverage.iterrows():
-            # Generate approximate coordinates for demonstration
-            # In production, you would have actual geographic coordinates
-            lat = punjab_coords[0] + np.random.uniform(-1, 1)
-            lon = punjab_coords[1] + np.random.uniform(-1, 1)
-            
-            coverage = row['coverage_percentage']
-            
-            # Color code based on coverage percentage
-            if coverage >= 90:
-                color = 'green'
-                icon = 'ok-sign'
-            elif coverage >= 75:
-                color = 'orange'
-                icon = 'warning-sign'
-            else:
-                color = 'red'
-                icon = 'remove-sign'
-            
-            folium.Marker(
-                location=[lat, lon],
-                popup=f"""
-                <b>{row['district']}</b><br>
-                Coverage: {coverage:.1f}%<br>
-                Status: {'Good' if coverage >= 90 else 'Needs Attention' if coverage >= 75 else 'Critical'}
-                """,
-                tooltip=f"{row['district']}: {coverage:.1f}%",
-                icon=folium.Icon(color=color, icon=icon)
-            ).add_to(m)
+        # Generate approximate coordinates for demonstration
+        # In production, you would have actual geographic coordinates
+        offsets = district_offsets(district_coverage['district'])
+        
+        # Color code based on coverage percentage
+        coverage = district_coverage['coverage_percentage'].to_numpy()
+        thresholds = [coverage >= 90, coverage >= 75]
+        colors = np.select(thresholds, ['green', 'orange'], 'red')
+        statuses = np.select(thresholds, ['Good', 'Needs Attention'], 'Critical')
+        
+        # All districts go into one GeoJSON layer rather than one marker each
+        features = [
+            {
+                'type': 'Feature',
+                'geometry': {
+                    'type': 'Point',
+                    'coordinates': [punjab_coords[1] + lon_offset, punjab_coords[0] + lat_offset]
+                },
+                'properties': {
+                    'color': color,
+                    'tooltip': f"{district}: {value:.1f}%",
+                    'popup': f"<b>{district}</b><br>Coverage: {value:.1f}%<br>Status: {status}"
+                }
+            }
+            for district, value, color, status, (lat_offset, lon_offset) in zip(
+                district_coverage['district'], coverage, colors.tolist(), statuses.tolist(), offsets.tolist()
+            )
+        ]
+        
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': features},
+            marker=folium.CircleMarker(radius=8, fill=True, fill_opacity=0.8),
+            style_function=lambda feature: {
+                'color': feature['properties']['color'],
+                'fillColor': feature['properties']['color']
+            },
+            tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False),
+            popup=folium.GeoJsonPopup(fields=['popup'], labels=False)
+        ).add_to(m)
         
         # Add legend
         legend_html = """
@@ -79,22 +133,33 @@ def create_coverage_map(df):
         st.error(f"Error creating map: {str(e)}")
         return None
 
-def create_vaccine_coverage_chart(df):
+def get_vaccine_stats(df):
+    """Coverage mean, std, min, max and count per vaccine type in one groupby pass."""
+    return df.groupby('vaccine_type', observed=True)['coverage_percentage'].agg(
+        ['mean', 'std', 'min', 'max', 'count']
+    ).reset_index()
+
+def create_vaccine_coverage_chart(df, vaccine_stats=None):
     """Create a bar chart showing coverage by vaccine type."""
     try:
-        vaccine_coverage = df.groupby('vaccine_type')['coverage_percentage'].mean().reset_index()
+        if vaccine_stats is None:
+            vaccine_stats = get_vaccine_stats(df)
+        vaccine_coverage = vaccine_stats[['vaccine_type', 'mean']].rename(columns={'mean': 'coverage_percentage'})
         vaccine_coverage = vaccine_coverage.sort_values('coverage_percentage', ascending=True)
         
-        fig = px.bar(
-            vaccine_coverage,
-            x='coverage_percentage',
-            y='vaccine_type',
+        coverage = vaccine_coverage['coverage_percentage'].to_numpy(dtype=np.float32)
+        fig = go.Figure(go.Bar(
+            x=coverage,
+            y=vaccine_coverage['vaccine_type'].to_numpy(),
             orientation='h',
+            marker=dict(color=coverage, coloraxis='coloraxis'),
+            hovertemplate='Coverage Percentage (%)=%{x}<br>Vaccine Type=%{y}<extra></extra>'
+        ))
+        fig.update_layout(
             title='Average Vaccination Coverage by Vaccine Type',
-            labels={'coverage_percentage': 'Coverage Percentage (%)', 'vaccine_type': 'Vaccine Type'},
-            color='coverage_percentage',
-            color_continuous_scale='RdYlGn',
-            range_color=[0, 100]
+            xaxis_title='Coverage Percentage (%)',
+            yaxis_title='Vaccine Type',
+            coloraxis=dict(colorscale='RdYlGn', cmin=0, cmax=100, colorbar_title='Coverage Percentage (%)')
         )
         
         # Add target line at 90%
@@ -123,13 +188,25 @@ def create_vaccine_coverage_chart(df):
 def create_coverage_distribution(df):
     """Create a histogram showing distribution of coverage percentages."""
     try:
-        fig = px.histogram(
-            df,
-            x='coverage_percentage',
-            nbins=20,
+        # Bin on the server so the figure carries 20 bars instead of every
+        # coverage value; fixed 5-point bins line up with the target lines
+        coverage = df['coverage_percentage'].dropna().to_numpy()
+        counts, edges = np.histogram(coverage, bins=20, range=(0, 100))
+        edges = edges.astype(np.float32)
+        
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            marker_color='#1f77b4',
+            hovertemplate='%{customdata[0]:.1f}-%{customdata[1]:.1f}%: %{y}<extra></extra>',
+            customdata=np.column_stack([edges[:-1], edges[1:]])
+        ))
+        fig.update_layout(
             title='Distribution of Vaccination Coverage Percentages',
-            labels={'coverage_percentage': 'Coverage Percentage (%)', 'count': 'Number of Records'},
-            color_discrete_sequence=['#1f77b4']
+            xaxis_title='Coverage Percentage (%)',
+            yaxis_title='Number of Records',
+            bargap=0
         )
         
         # Add target lines
@@ -144,19 +221,19 @@ def create_coverage_distribution(df):
         st.error(f"Error creating coverage distribution: {str(e)}")
         return go.Figure()
 
-def create_vaccine_comparison_chart(df):
+def create_vaccine_comparison_chart(df, vaccine_stats=None):
     """Create a detailed comparison chart of all vaccines."""
     try:
         # Calculate statistics by vaccine
-        vaccine_stats = df.groupby('vaccine_type').agg({
-            'coverage_percentage': ['mean', 'std', 'min', 'max', 'count']
-        }).round(2)
-        
-        vaccine_stats.columns = ['mean', 'std', 'min', 'max', 'count']
-        vaccine_stats = vaccine_stats.reset_index()
+        if vaccine_stats is None:
+            vaccine_stats = get_vaccine_stats(df)
+        vaccine_stats = vaccine_stats.round(2)
         
+        # Every panel has the same vaccine axis, so the columns share x and
+        # only the bottom row draws its tick labels
         fig = make_subplots(
             rows=2, cols=2,
+            shared_xaxes=True,
             subplot_titles=('Average Coverage', 'Coverage Range', 'Standard Deviation', 'Sample Size'),
             specs=[[{"secondary_y": False}, {"secondary_y": False}],
                    [{"secondary_y": False}, {"secondary_y": False}]]
@@ -214,7 +291,10 @@ def create_timeline_chart(df):
     """Create a timeline chart showing coverage trends over time."""
     try:
         # Group by date and calculate average coverage
-        timeline_data = df.groupby(['date', 'vaccine_type'])['coverage_percentage'].mean().reset_index()
+        timeline_data = df.groupby(['date', 'vaccine_type'], observed=True)['coverage_percentage'].mean().reset_index()
+        timeline_data = downsample_timeline(timeline_data)
+        # float32 halves the plotted payload; the statistics stay float64
+        timeline_data['coverage_percentage'] = timeline_data['coverage_percentage'].astype(np.float32)
         
         fig = px.line(
             timeline_data,
@@ -222,7 +302,8 @@ def create_timeline_chart(df):
             y='coverage_percentage',
             color='vaccine_type',
             title='Vaccination Coverage Trends Over Time',
-            labels={'coverage_percentage': 'Coverage Percentage (%)', 'date': 'Date'}
+            labels={'coverage_percentage': 'Coverage Percentage (%)', 'date': 'Date'},
+            render_mode='webgl'
         )
         
         # Add target line
@@ -245,7 +326,9 @@ def create_monthly_activity_chart(df):
     """Create a chart showing monthly vaccination activity."""
     try:
         monthly_data = df.groupby(['year', 'month']).size().reset_index(name='vaccinations')
-        monthly_data['date_str'] = monthly_data['year'].astype(str) + '-' + monthly_data['month'].astype(str).str.zfill(2)
+        monthly_data['date_str'] = pd.PeriodIndex.from_fields(
+            year=monthly_data['year'], month=monthly_data['month'], freq='M'
+        ).astype(str)
         
         fig = px.bar(
             monthly_data,
@@ -267,19 +350,23 @@ def create_seasonal_pattern_chart(df):
     """Create a chart showing seasonal vaccination patterns."""
     try:
         seasonal_data = df.groupby('month')['coverage_percentage'].mean().reset_index()
-        seasonal_data['month_name'] = pd.to_datetime(seasonal_data['month'], format='%m').dt.strftime('%B')
+        seasonal_data['month_name'] = MONTH_NAMES[seasonal_data['month'].to_numpy()]
         
-        fig = px.line(
-            seasonal_data,
-            x='month_name',
-            y='coverage_percentage',
+        fig = go.Figure(go.Scatter(
+            x=seasonal_data['month_name'].to_numpy(),
+            y=seasonal_data['coverage_percentage'].to_numpy(dtype=np.float32),
+            mode='lines+markers',
+            hovertemplate='Month=%{x}<br>Average Coverage (%)=%{y}<extra></extra>'
+        ))
+        
+        fig.update_layout(
             title='Seasonal Vaccination Patterns',
-            labels={'coverage_percentage': 'Average Coverage (%)', 'month_name': 'Month'},
-            markers=True
+            xaxis_title='Month',
+            yaxis_title='Average Coverage (%)',
+            height=400,
+            xaxis={'tickangle': 45}
         )
         
-        fig.update_layout(height=400, xaxis={'tickangle': 45})
-        
         return fig
         
     except Exception as e:
@@ -289,17 +376,21 @@ def create_seasonal_pattern_chart(df):
 def create_age_group_chart(df):
     """Create a chart showing coverage by age group."""
     try:
-        age_data = df.groupby('age_group')['coverage_percentage'].mean().reset_index()
+        age_data = df.groupby('age_group', observed=True)['coverage_percentage'].mean().reset_index()
         age_data = age_data.sort_values('coverage_percentage', ascending=False)
         
-        fig = px.bar(
-            age_data,
-            x='age_group',
-            y='coverage_percentage',
+        coverage = age_data['coverage_percentage'].to_numpy(dtype=np.float32)
+        fig = go.Figure(go.Bar(
+            x=age_data['age_group'].to_numpy(),
+            y=coverage,
+            marker=dict(color=coverage, coloraxis='coloraxis'),
+            hovertemplate='Age Group=%{x}<br>Coverage Percentage (%)=%{y}<extra></extra>'
+        ))
+        fig.update_layout(
             title='Vaccination Coverage by Age Group',
-            labels={'coverage_percentage': 'Coverage Percentage (%)', 'age_group': 'Age Group'},
-            color='coverage_percentage',
-            color_continuous_scale='Viridis'
+            xaxis_title='Age Group',
+            yaxis_title='Coverage Percentage (%)',
+            coloraxis=dict(colorscale='Viridis', colorbar_title='Coverage Percentage (%)')
         )
         
         fig.add_hline(y=90, line_dash="dash", line_color="red")
@@ -314,20 +405,28 @@ def create_age_group_chart(df):
 def create_gender_chart(df):
     """Create a chart showing coverage by gender."""
     try:
-        gender_data = df.groupby(['gender', 'vaccine_type'])['coverage_percentage'].mean().reset_index()
-        
-        fig = px.bar(
-            gender_data,
-            x='vaccine_type',
-            y='coverage_percentage',
-            color='gender',
-            barmode='group',
-            title='Vaccination Coverage by Gender',
-            labels={'coverage_percentage': 'Coverage Percentage (%)', 'vaccine_type': 'Vaccine Type'}
-        )
+        # Vaccine types as rows and one column per gender, so each gender is
+        # one trace
+        gender_data = df.groupby(['vaccine_type', 'gender'], observed=True)['coverage_percentage'].mean().unstack('gender')
+        vaccine_types = gender_data.index.to_numpy()
+        
+        fig = go.Figure([
+            go.Bar(
+                x=vaccine_types,
+                y=gender_data[gender].to_numpy(dtype=np.float32),
+                name=gender,
+                hovertemplate=f'gender={gender}<br>Vaccine Type=%{{x}}<br>Coverage Percentage (%)=%{{y}}<extra></extra>'
+            )
+            for gender in gender_data.columns
+        ])
         
         fig.add_hline(y=90, line_dash="dash", line_color="red")
         fig.update_layout(
+            title='Vaccination Coverage by Gender',
+            xaxis_title='Vaccine Type',
+            yaxis_title='Coverage Percentage (%)',
+            legend_title_text='gender',
+            barmode='group',
             height=400,
             xaxis={'tickangle': 45}
         )